@@ -5,110 +5,660 @@ High-performance script to gather comprehensive activity data for all organizati
 """
 
 import asyncio
+import functools
 import aiohttp
-import json
+from collections import deque
+import orjson
 import os
-from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+import random
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Any, Callable, Literal, Optional, Tuple, TypedDict
+from urllib.parse import urlencode
 import argparse
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, field
 from concurrent.futures import ThreadPoolExecutor
 import time
 
-@dataclass
+try:
+    import msgspec
+except ImportError:  # optional: decodes search results straight into the fields we use
+    msgspec = None
+
+def iso_timestamp(date_str: str) -> float:
+    """Unix time of an ISO-8601 string. GraphQL commit dates keep the author's UTC offset
+    (REST dates end in 'Z'), so the strings themselves don't sort chronologically."""
+    return datetime.fromisoformat(date_str.replace('Z', '+00:00')).timestamp()
+
+@dataclass(slots=True)
 class ActivityData:
     username: str
     repo_name: str
     activity_type: str
-    date: str
+    date: str  # raw ISO-8601 timestamp from the API; formatted only when reports are written
     details: Dict[str, Any]
+    additions: int = 0
+    deletions: int = 0
+    activity_subtype: str = ""  # "merged"/"open"/"closed" for PRs, state for issues
+    files_changed: Optional[List[Dict[str, Any]]] = None  # only populated with --with-files
+    ts: float = field(init=False)  # `date` as a Unix timestamp, for ordering
+
+    def __post_init__(self):
+        self.ts = iso_timestamp(self.date)
+
+@dataclass
+class MemberStats:
+    """Running totals for one member, updated as each activity is collected"""
+    first_date: Optional[str] = None
+    first_commit_date: Optional[str] = None
+    last_commit_date: Optional[str] = None
+    commits: int = 0
+    prs: int = 0
+    issues: int = 0
+    additions: int = 0
+    deletions: int = 0
+    # Timestamps of the three dates above, which are kept as strings for display
+    first_ts: float = float('inf')
+    first_commit_ts: float = float('inf')
+    last_commit_ts: float = float('-inf')
+
+    @property
+    def activities(self) -> int:
+        return self.commits + self.prs + self.issues
+
+    def add(self, a: ActivityData):
+        if a.ts < self.first_ts:
+            self.first_ts, self.first_date = a.ts, a.date
+        if a.activity_type == "commit":
+            self.commits += 1
+            if a.ts < self.first_commit_ts:
+                self.first_commit_ts, self.first_commit_date = a.ts, a.date
+            if a.ts > self.last_commit_ts:
+                self.last_commit_ts, self.last_commit_date = a.ts, a.date
+        elif a.activity_type == "pull_request":
+            self.prs += 1
+        elif a.activity_type == "issue":
+            self.issues += 1
+        if a.activity_type in ("commit", "pull_request"):
+            self.additions += a.additions
+            self.deletions += a.deletions
+
+# REST requests allowed per hour for an authenticated token
+RATE_LIMIT_PER_HOUR = 5000
+# GraphQL is metered separately, in points per hour (most of our queries cost one point)
+GRAPHQL_POINTS_PER_HOUR = 5000
+# The Search API has its own, much smaller bucket, and never returns more than 1000 results
+SEARCH_LIMIT_PER_MINUTE = 30
+SEARCH_MAX_RESULTS = 1000
+MAX_ATTEMPTS = 6
+MAX_BACKOFF = 60
+# GitHub asks for at least a minute's pause after a secondary rate limit that names no Retry-After
+SECONDARY_LIMIT_WAIT = 60
+
+def backoff_delay(attempt: int) -> float:
+    """Exponential backoff with jitter for retry `attempt` (0-based), capped at MAX_BACKOFF"""
+    return min(MAX_BACKOFF, 2 ** attempt + random.random())
+
+# PRs (or user logins) per aliased GraphQL query; keeps each query well inside GitHub's node limits
+PR_BATCH_SIZE = 50
+# Smaller batches when each PR also brings up to 100 file nodes
+PR_FILES_BATCH_SIZE = 25
+
+# GraphQL PatchStatus -> the REST `status` values used in files_changed
+CHANGE_TYPES = {
+    'ADDED': 'added', 'DELETED': 'removed', 'MODIFIED': 'modified',
+    'RENAMED': 'renamed', 'COPIED': 'copied', 'CHANGED': 'changed'
+}
+
+class TokenBucket:
+    """Async token bucket that paces requests to `capacity` per `period` seconds.
+
+    The bucket is kept in step with GitHub's own accounting via `sync`, which is fed the
+    X-RateLimit-Remaining/X-RateLimit-Reset headers of every response.
+    """
+    def __init__(self, capacity: int, period: float):
+        self.capacity = capacity
+        self.period = period
+        self.rate = capacity / period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.reset_at = 0
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def resize(self, capacity: int):
+        """Adopt the quota GitHub reports for this token (X-RateLimit-Limit); `sync` then
+        brings the token count down to what is actually left"""
+        self.capacity = capacity
+        self.rate = capacity / self.period
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def sync(self, remaining: int, reset_at: int):
+        self._refill()
+        self.tokens = min(self.tokens, remaining)
+        if remaining == 0:
+            self.reset_at = reset_at
+
+    async def acquire(self):
+        async with self.lock:
+            wait_time = self.reset_at - time.time()
+            if wait_time > 0:
+                print(f"Rate limit exhausted, waiting {int(wait_time) + 1} seconds...")
+                await asyncio.sleep(wait_time + 1)
+                self.tokens = float(self.capacity)
+            self._refill()
+            if self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+# How long a cached response is kept before it is dropped from the ETag cache
+CACHE_TTL = 7 * 24 * 3600
+
+class ETagCache:
+    """SQLite-backed store of (etag, last_modified, body, last_page) per request key.
+
+    Pass a file path to keep validators across runs; the default ":memory:" lasts for one run.
+    Each paginated page has its own key because the page number is part of the params.
+    """
+    def __init__(self, path: str = ":memory:", ttl: float = CACHE_TTL):
+        self.ttl = ttl
+        self.db = sqlite3.connect(path, isolation_level=None)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, last_page INTEGER, body BLOB, expires REAL)"
+        )
+        self.db.execute("DELETE FROM responses WHERE expires < ?", (time.time(),))
+
+    def get(self, key: str) -> Optional[Tuple[Optional[str], Optional[str], Any, Optional[int]]]:
+        row = self.db.execute(
+            "SELECT etag, last_modified, body, last_page FROM responses WHERE url = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, body, last_page = row
+        return etag, last_modified, orjson.loads(body), last_page
+
+    def set(self, key: str, etag: Optional[str], last_modified: Optional[str], data: Any, last_page: Optional[int]):
+        self.db.execute(
+            "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?)",
+            (key, etag, last_modified, last_page, orjson.dumps(data), time.time() + self.ttl)
+        )
+
+    def close(self):
+        self.db.close()
+
+class AdmissionController:
+    """Adaptive cap on in-flight requests (additive increase, multiplicative decrease).
+
+    Every finished request reports its latency and whether GitHub pushed back (403/429/5xx or a
+    connection error). Pushback multiplies the limit by `decrease`, at most once per
+    `target_latency` so a single burst of errors doesn't collapse it straight to `c_min`.
+    Otherwise the limit grows by `increase` while the mean latency over the last `window`
+    requests stays under `target_latency`, and holds when it doesn't: GraphQL and Search calls
+    are routinely slower than that without anything being wrong, so latency alone never shrinks it.
+    """
+    def __init__(self, c_max: int = 64, c_min: int = 2, target_latency: float = 1.5,
+                 window: int = 32, increase: float = 0.5, decrease: float = 0.5):
+        self.c_max = c_max
+        self.c_min = min(c_min, c_max)
+        self.target_latency = target_latency
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = float(c_max)
+        self.in_flight = 0
+        self.latencies = deque(maxlen=window)
+        self.last_decrease = 0.0
+        self.cond = asyncio.Condition()
+
+    def slot(self) -> "AdmissionSlot":
+        return AdmissionSlot(self)
+
+    async def acquire(self):
+        async with self.cond:
+            await self.cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: float, congested: bool):
+        async with self.cond:
+            self.in_flight -= 1
+            self.latencies.append(latency)
+            mean_latency = sum(self.latencies) / len(self.latencies)
+            now = time.monotonic()
+            if congested:
+                if now - self.last_decrease >= self.target_latency:
+                    self.limit = max(self.c_min, self.limit * self.decrease)
+                    self.last_decrease = now
+            elif mean_latency <= self.target_latency:
+                self.limit = min(self.c_max, self.limit + self.increase)
+            self.cond.notify_all()
+
+class AdmissionSlot:
+    """One admitted request; set `congested` when GitHub pushed back.
+
+    Only pushback counts: an escaping connection error or timeout does, but cancellation and
+    local failures (e.g. a body that doesn't decode) say nothing about GitHub's load.
+    """
+    def __init__(self, controller: AdmissionController):
+        self.controller = controller
+        self.congested = False
+        self.started = 0.0
+
+    async def __aenter__(self):
+        await self.controller.acquire()
+        self.started = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pushed_back = exc_type is not None and issubclass(exc_type, (aiohttp.ClientError, asyncio.TimeoutError))
+        await self.controller.release(time.monotonic() - self.started, self.congested or pushed_back)
+
+class RateLimitGovernor:
+    """Single place that decides when the next request may go out.
+
+    Combines one TokenBucket per rate-limit resource ("core", "search", "graphql"), each resized
+    to the token's real quota from the X-RateLimit-Limit of its first response, with two header-driven
+    brakes: once fewer than `pace_fraction` of a resource's quota remains before X-RateLimit-Reset,
+    that resource's requests are spaced evenly over the time left; and a Retry-After (secondary rate limit) closes `gate`
+    for everyone until it expires.
+    """
+    def __init__(self, pace_fraction: float = 0.01):
+        self.pace_fraction = pace_fraction
+        self.buckets = {
+            'core': TokenBucket(RATE_LIMIT_PER_HOUR, 3600),
+            'search': TokenBucket(SEARCH_LIMIT_PER_MINUTE, 60),
+            'graphql': TokenBucket(GRAPHQL_POINTS_PER_HOUR, 3600)
+        }
+        # 50 of 5000 for core and GraphQL; below one request for Search, whose
+        # 30-per-minute bucket already spaces requests out
+        self.thresholds = {resource: bucket.capacity * pace_fraction for resource, bucket in self.buckets.items()}
+        self.calibrated = set()
+        self.remaining: Dict[str, int] = {}
+        self.reset_at: Dict[str, int] = {}
+        self.secondary_retry_after = 0
+        self.paused_until = 0.0
+        self.gate = asyncio.Event()
+        self.gate.set()
+        # One per resource, so a paced Search call never holds up core or GraphQL requests
+        self.pace_locks = {resource: asyncio.Lock() for resource in self.buckets}
+
+    async def acquire(self, resource: str = 'core'):
+        await self.gate.wait()
+        await self.buckets[resource].acquire()
+        remaining = self.remaining.get(resource)
+        if remaining is not None and 0 < remaining < self.thresholds[resource]:
+            # Holding the lock while sleeping serializes callers, so they leave one interval apart
+            async with self.pace_locks[resource]:
+                await asyncio.sleep(max(0, self.reset_at[resource] - time.time()) / remaining)
+
+    def exhausted(self, resource: str, reset_at: int):
+        """Hold every request for `resource` until `reset_at` (a Unix time)"""
+        self.remaining[resource] = 0
+        self.reset_at[resource] = reset_at
+        self.buckets[resource].sync(0, reset_at)
+
+    def update(self, headers) -> Optional[int]:
+        """Record the quota headers of a response; returns Retry-After if GitHub sent one"""
+        resource = headers.get('X-RateLimit-Resource', 'core')
+        if resource in self.buckets and 'X-RateLimit-Remaining' in headers:
+            limit = headers.get('X-RateLimit-Limit')
+            if limit and resource not in self.calibrated:
+                # The defaults assume a standard token; apps and enterprise tokens get more
+                self.calibrated.add(resource)
+                self.buckets[resource].resize(int(limit))
+                self.thresholds[resource] = int(limit) * self.pace_fraction
+            self.remaining[resource] = int(headers['X-RateLimit-Remaining'])
+            self.reset_at[resource] = int(headers.get('X-RateLimit-Reset', 0))
+            self.buckets[resource].sync(self.remaining[resource], self.reset_at[resource])
+        retry_after = headers.get('Retry-After')
+        if retry_after is None:
+            return None
+        self.secondary_retry_after = int(retry_after)
+        self.pause(self.secondary_retry_after)
+        return self.secondary_retry_after
+
+    def pause(self, seconds: float):
+        """Close `gate` for `seconds`; overlapping pauses keep it closed until the latest one ends"""
+        until = time.monotonic() + seconds
+        if until <= self.paused_until:
+            return
+        self.paused_until = until
+        self.gate.clear()
+        asyncio.get_running_loop().call_later(seconds, self._reopen)
+
+    def _reopen(self):
+        if time.monotonic() >= self.paused_until:
+            self.gate.set()
+
+USER_ID_QUERY = """
+query($login: String!) {
+  user(login: $login) { id }
+}
+"""
+
+# Walks the default branch history for one author; additions/deletions come back
+# inline so no per-commit REST call is needed
+COMMIT_HISTORY_QUERY = """
+query($owner: String!, $name: String!, $authorId: ID!, $since: GitTimestamp!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: 100, after: $cursor, since: $since, author: {id: $authorId}) {
+            pageInfo { hasNextPage endCursor }
+            nodes { oid message authoredDate additions deletions changedFilesIfAvailable url }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Summary mode: only the fields MemberStats needs, without message/url payloads
+COMMIT_STATS_QUERY = """
+query($owner: String!, $name: String!, $authorId: ID!, $since: GitTimestamp!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: 100, after: $cursor, since: $since, author: {id: $authorId}) {
+            pageInfo { hasNextPage endCursor }
+            nodes { oid authoredDate additions deletions }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+# Shapes of the /search responses, as far as this script reads them. With msgspec installed
+# they are decoded through these schemas: every other field (user objects, reactions, bodies...)
+# is skipped by the parser instead of being built into dicts, and the results stay plain dicts.
+class SearchLabel(TypedDict):
+    name: str
+
+class SearchPullRequestRef(TypedDict, total=False):
+    url: str
+    merged_at: Optional[str]
+
+class SearchIssueItem(TypedDict, total=False):
+    number: int
+    title: str
+    state: str
+    html_url: str
+    created_at: str
+    updated_at: str
+    closed_at: Optional[str]
+    labels: List[SearchLabel]
+    pull_request: SearchPullRequestRef
+
+class SearchIssuesPage(TypedDict, total=False):
+    total_count: int
+    items: List[SearchIssueItem]
+
+class SearchCount(TypedDict, total=False):
+    total_count: int
+
+SEARCH_ISSUES_DECODER = msgspec.json.Decoder(SearchIssuesPage) if msgspec else None
+SEARCH_COUNT_DECODER = msgspec.json.Decoder(SearchCount) if msgspec else None
+
+# Ordinal suffix by last digit of the day; 11th-13th are special-cased in format_date
+DAY_SUFFIX = ('th', 'st', 'nd', 'rd', 'th', 'th', 'th', 'th', 'th', 'th')
+
+@functools.lru_cache(maxsize=65536)
+def format_date(date_str):
+    # Handles both ISO and 'YYYY-MM-DD HH:MM:SS' formats. Cached: the same timestamps
+    # (created_at/updated_at, repo creation date) are formatted many times per run.
+    if not date_str or date_str == 'N/A':
+        return 'N/A'
+    # fromisoformat (C-implemented) accepts both the 'T' and the space separator. Aware
+    # timestamps (GraphQL commit dates keep the author's offset) are shown in UTC like REST ones.
+    try:
+        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+    except ValueError:
+        return date_str
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    day = dt.day
+    suffix = 'th' if 11 <= day <= 13 else DAY_SUFFIX[day % 10]
+    return f"{day}{suffix} {dt.strftime('%B %Y %H:%M:%S')}"
 
 class GitHubRepoTracker:
-    def format_date(self, date_str):
-        # Handles both ISO and 'YYYY-MM-DD HH:MM:SS' formats
-        from datetime import datetime
-        import re
-        if not date_str or date_str == 'N/A':
-            return 'N/A'
-        # Try ISO format first
-        try:
-            dt = datetime.strptime(date_str[:19], '%Y-%m-%dT%H:%M:%S')
-        except Exception:
-            try:
-                dt = datetime.strptime(date_str, '%Y-%m-%d %H:%M:%S')
-            except Exception:
-                return date_str
-        day = dt.day
-        suffix = 'th' if 11 <= day <= 13 else {1:'st',2:'nd',3:'rd'}.get(day%10, 'th')
-        return f"{day}{suffix} {dt.strftime('%B %Y %H:%M:%S')}"
+    async def _get_repo_info(self) -> Optional[Dict]:
+        """Fetch the repository metadata once; later callers get the stored copy"""
+        async with self._repo_info_lock:
+            if self._repo_info is None:
+                self._repo_info = await self.make_request(self._repo_url) or {}
+        return self._repo_info or None
+
     async def get_repo_creation_date(self) -> str:
         """Get the repository creation date"""
-        url = f"{self.base_url}/repos/{self.full_repo_name}"
-        data = await self.make_request(url)
-        if data and len(data) > 0:
-            repo_info = data[0]
+        repo_info = await self._get_repo_info()
+        if repo_info:
             return repo_info.get('created_at', 'N/A')
         return "N/A"
-    def __init__(self, token: str, org_name: str, repo_name: str, max_concurrent: int = 20):
+    def __init__(self, token: str, org_name: str, repo_name: str, max_concurrent: int = 20,
+                 with_files: bool = False, cache_path: Optional[str] = None, max_connections: int = 64,
+                 active_only: bool = False, summary_only: bool = False):
         self.token = token
         self.org_name = org_name
         self.repo_name = repo_name
         self.full_repo_name = f"{org_name}/{repo_name}"
         self.base_url = "https://api.github.com"
+        self.graphql_url = f"{self.base_url}/graphql"
+        # Endpoint URLs are built once here rather than on every call
+        self._repo_url = f"{self.base_url}/repos/{self.full_repo_name}"
+        self._contributors_url = f"{self._repo_url}/contributors"
+        self._contributor_stats_url = f"{self._repo_url}/stats/contributors"
+        self._members_url = f"{self.base_url}/orgs/{org_name}/members"
+        self._commit_detail = self._repo_url + "/commits/{}"
+        self._pull_files = self._repo_url + "/pulls/{}/files"
+        self._search_commits_url = f"{self.base_url}/search/commits"
+        self._search_issues_url = f"{self.base_url}/search/issues"
         self.headers = {
             "Authorization": f"token {token}",
             "Accept": "application/vnd.github+json",
             "X-GitHub-Api-Version": "2022-11-28"
         }
         self.max_concurrent = max_concurrent
+        self.max_connections = max_connections
+        self.with_files = with_files
+        self.active_only = active_only
+        self.summary_only = summary_only
         self.session = None
-        self.semaphore = None
+        self.admission = None
+        self.writer_queue = None
+        self._writer_task = None
+        self.output_dir = None
+        self.write_failures: List[str] = []
+        self._author_ids: Dict[str, Optional[str]] = {}
+        self._repo_info: Optional[Dict] = None
+        self._repo_info_lock = asyncio.Lock()
+        # Conditional-request cache. 304 replies don't count against the rate limit, so
+        # unchanged resources are served from here for free.
+        self.cache_path = cache_path
+        self._cache = None
+        # key -> [task running the request, number of callers awaiting it]
+        self._inflight: Dict[str, List[Any]] = {}
+        self.governor = None
         
     async def __aenter__(self):
-        connector = aiohttp.TCPConnector(limit=100, limit_per_host=30)
+        # Everything goes to api.github.com, so the total and per-host limits are the same
+        # number, and it is also the ceiling of the admission controller: a request it admits
+        # always has a socket available instead of queueing inside the connector (the same
+        # one-knob model as httpx's 100-connection pool default). Pooled connections are kept
+        # alive long enough to survive rate-limit pauses.
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_connections,
+            keepalive_timeout=60,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True
+        )
         timeout = aiohttp.ClientTimeout(total=30, connect=10)
         self.session = aiohttp.ClientSession(
             headers=self.headers,
+            json_serialize=lambda obj: orjson.dumps(obj).decode(),
             connector=connector,
             timeout=timeout
         )
-        self.semaphore = asyncio.Semaphore(self.max_concurrent)
+        self.admission = AdmissionController(c_max=self.max_connections)
+        self.governor = RateLimitGovernor()
+        # Within one run nothing is fetched twice (concurrent duplicates share _inflight), so
+        # the cache only pays for itself when it is kept on disk for the next run
+        self._cache = ETagCache(self.cache_path) if self.cache_path else None
+        self.writer_queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
+        if self._writer_task:
+            await self.writer_queue.put(None)
+            await self._writer_task
         if self.session:
             await self.session.close()
+        if self._cache:
+            self._cache.close()
 
-    async def make_request(self, url: str, params: Optional[Dict] = None) -> Optional[List[Dict]]:
-        """Make rate-limited API request with error handling"""
-        async with self.semaphore:
-            try:
-                async with self.session.get(url, params=params) as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        return data if isinstance(data, list) else [data]
-                    elif response.status == 403:
-                        # Rate limit hit
-                        reset_time = int(response.headers.get('X-RateLimit-Reset', 0))
-                        wait_time = max(0, reset_time - int(time.time())) + 1
-                        print(f"Rate limit hit, waiting {wait_time} seconds...")
-                        await asyncio.sleep(wait_time)
-                        return await self.make_request(url, params)
-                    else:
-                        print(f"API request failed: {response.status} for {url}")
-                        return None
-            except Exception as e:
-                print(f"Request error for {url}: {str(e)}")
-                return None
+    async def make_request(self, url: str, params: Optional[Dict] = None,
+                           resource: str = 'core', decoder: Optional[Any] = None) -> Optional[Any]:
+        """Make rate-limited API request with retries and error handling.
+
+        Returns the decoded JSON as-is: a list for list endpoints, a dict for single objects.
+        `decoder` (a msgspec Decoder, or None for orjson) narrows the body to a typed schema.
+        """
+        data, _ = await self._fetch(url, params, resource, decoder)
+        return data
+
+    async def _fetch(self, url: str, params: Optional[Dict] = None, resource: str = 'core',
+                     decoder: Optional[Any] = None) -> Tuple[Optional[Any], Optional[int]]:
+        """make_request that also returns the page number of the Link rel="last" header, if any.
+
+        Concurrent calls for the same URL and params share one HTTP request, run as its own task.
+        A caller that is cancelled only stops waiting; the request carries on for the others and
+        is cancelled only once nobody is waiting for it any more.
+        """
+        key = url + "?" + urlencode(sorted((params or {}).items()))
+        entry = self._inflight.get(key)
+        if entry is None:
+            task = asyncio.create_task(self._get(url, params, resource, key, decoder))
+            entry = self._inflight[key] = [task, 0]
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        task = entry[0]
+        entry[1] += 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not task.done():
+                task.cancel()
+
+    async def _get(self, url: str, params: Optional[Dict], resource: str, key: str,
+                   decoder: Optional[Any] = None) -> Tuple[Optional[Any], Optional[int]]:
+        cached = self._cache.get(key) if self._cache else None
+        headers = {}
+        if cached:
+            etag, last_modified, _, _ = cached
+            if etag:
+                headers['If-None-Match'] = etag
+            elif last_modified:
+                headers['If-Modified-Since'] = last_modified
+
+        for attempt in range(MAX_ATTEMPTS):
+            await self.governor.acquire(resource)
+            async with self.admission.slot() as slot:
+                try:
+                    async with self.session.get(url, params=params, headers=headers) as response:
+                        retry_after = self.governor.update(response.headers)
+                        slot.congested = response.status >= 500
+                        if response.status == 304 and cached:
+                            data, last_page = cached[2], cached[3]
+                            return data, last_page
+                        elif response.status == 200:
+                            body = await response.read()
+                            data = decoder.decode(body) if decoder else orjson.loads(body)
+                            last = response.links.get('last')
+                            last_page = int(last['url'].query.get('page', 1)) if last else None
+                            etag = response.headers.get('ETag')
+                            last_modified = response.headers.get('Last-Modified')
+                            if self._cache and (etag or last_modified):
+                                self._cache.set(key, etag, last_modified, data, last_page)
+                            return data, last_page
+                        elif response.status in (403, 429):
+                            if await self._rate_limited(response, retry_after):
+                                slot.congested = True
+                                continue
+                            # Permissions, SSO and the like: retrying won't help
+                            print(f"API request failed: {response.status} for {url}")
+                            return None, None
+                        elif response.status == 202:
+                            # Statistics endpoints answer 202 while GitHub is still computing them
+                            return None, None
+                        elif response.status < 500:
+                            print(f"API request failed: {response.status} for {url}")
+                            return None, None
+                        print(f"Retryable status {response.status} for {url} (attempt {attempt + 1}/{MAX_ATTEMPTS})")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    slot.congested = True
+                    print(f"Request error for {url} (attempt {attempt + 1}/{MAX_ATTEMPTS}): {str(e)}")
+                except Exception as e:
+                    print(f"Request error for {url}: {str(e)}")
+                    return None, None
+            await asyncio.sleep(backoff_delay(attempt))
+        print(f"Giving up on {url} after {MAX_ATTEMPTS} attempts")
+        return None, None
+
+    async def _rate_limited(self, response: aiohttp.ClientResponse, retry_after: Optional[int]) -> bool:
+        """Whether a 403/429 is GitHub rate limiting (worth retrying) rather than a refusal.
+
+        Retry-After and an exhausted quota are already being waited out by the governor; a
+        secondary limit reported only in the body pauses every request for SECONDARY_LIMIT_WAIT.
+        """
+        if retry_after is not None:
+            print(f"Secondary rate limit hit, pausing {retry_after} seconds...")
+            return True
+        if response.headers.get('X-RateLimit-Remaining') == '0':
+            # The token bucket now holds every request until the reset time
+            return True
+        body = await response.read()
+        if response.status == 429 or b'rate limit' in body.lower():
+            print(f"Secondary rate limit hit, pausing {SECONDARY_LIMIT_WAIT} seconds...")
+            self.governor.pause(SECONDARY_LIMIT_WAIT)
+            return True
+        return False
+
+    async def paged(self, url: str, params: Optional[Dict] = None) -> List[Dict]:
+        """Fetch every page of a list endpoint; pages 2..N are requested concurrently
+        once the Link header of page 1 tells us N"""
+        params = {**(params or {}), "per_page": 100}
+        first_page, last_page = await self._fetch(url, {**params, "page": 1})
+        if not first_page:
+            return []
+        results = list(first_page)
+        if last_page:
+            pages = await asyncio.gather(*[self.make_request(url, {**params, "page": page})
+                                           for page in range(2, last_page + 1)])
+            for page in pages:
+                if page:
+                    results.extend(page)
+        return results
 
     async def check_repo_exists(self) -> bool:
         """Check if the repository exists and is accessible"""
         print(f"🔍 Checking if repository {self.full_repo_name} exists...")
-        url = f"{self.base_url}/repos/{self.full_repo_name}"
         
-        data = await self.make_request(url)
-        if data and len(data) > 0:
-            repo_info = data[0]
+        repo_info = await self._get_repo_info()
+        if repo_info:
             print(f"✅ Repository found: {repo_info.get('full_name')}")
             print(f"   Description: {repo_info.get('description', 'No description')}")
             print(f"   Language: {repo_info.get('language', 'Not specified')}")
@@ -121,234 +671,497 @@ class GitHubRepoTracker:
     async def get_repo_contributors(self) -> List[str]:
         """Get all contributors to the repository"""
         print(f"Fetching contributors for {self.full_repo_name}...")
-        contributors = []
-        page = 1
-        
-        while True:
-            url = f"{self.base_url}/repos/{self.full_repo_name}/contributors"
-            params = {"page": page, "per_page": 100}
-            
-            data = await self.make_request(url, params)
-            if not data:
-                break
-                
-            batch_contributors = [contributor["login"] for contributor in data if contributor["type"] == "User"]
-            contributors.extend(batch_contributors)
-            
-            if len(data) < 100:
-                break
-            page += 1
-            
+        data = await self.paged(self._contributors_url)
+        contributors = [contributor["login"] for contributor in data if contributor["type"] == "User"]
         print(f"Found {len(contributors)} contributors")
         return contributors
 
     async def get_org_members(self) -> List[str]:
         """Get all organization members"""
         print(f"Fetching organization members for {self.org_name}...")
-        members = []
-        page = 1
-        
-        while True:
-            url = f"{self.base_url}/orgs/{self.org_name}/members"
-            params = {"page": page, "per_page": 100}
-            
-            data = await self.make_request(url, params)
-            if not data:
-                break
-                
-            batch_members = [member["login"] for member in data]
-            members.extend(batch_members)
-            
-            if len(batch_members) < 100:
-                break
-            page += 1
-            
+        data = await self.paged(self._members_url)
+        members = [member["login"] for member in data]
         print(f"Found {len(members)} organization members")
         return members
 
-    async def get_commits_for_member(self, member: str, since: str) -> List[ActivityData]:
-        """Get commits for a specific member in the repository"""
-        url = f"{self.base_url}/repos/{self.full_repo_name}/commits"
-        params = {
-            "author": member,
-            "since": since,
-            "per_page": 100
-        }
-        
-        commits_data = await self.make_request(url, params)
-        if not commits_data:
+    async def get_window_commit_counts(self, since: str) -> Optional[Dict[str, int]]:
+        """Commits per contributor since `since`, from the weekly counts of one /stats/contributors call.
+
+        GitHub only reports the top 100 contributors here, so a missing login means "unknown",
+        not "no commits". Returns None while GitHub is still computing the statistics, and for
+        repositories with 10,000+ commits, where GitHub reports every statistic as 0.
+        """
+        data = await self.make_request(self._contributor_stats_url)
+        if not isinstance(data, list):
+            return None
+        if not any(entry.get('total') for entry in data):
+            return None
+        # A week counts if any part of it falls inside the window
+        window_start = datetime.fromisoformat(since.replace('Z', '+00:00')).timestamp() - 7 * 86400
+        counts = {}
+        for entry in data:
+            author = entry.get('author')
+            if author:
+                counts[author['login']] = sum(week['c'] for week in entry.get('weeks', []) if week['w'] > window_start)
+        return counts
+
+    async def members_with_activity(self, members: List[str], since: str) -> List[str]:
+        """Keep only members who authored a commit since `since`.
+
+        Members covered by /stats/contributors are decided from it; the rest cost one Search API
+        call each. Search allows 30 requests per minute, so these calls go through their own token bucket.
+        """
+        # The statistics are a cached, lazily recomputed view, so they are only consulted here
+        window_commits = await self.get_window_commit_counts(since) or {}
+
+        async def commit_count(member: str) -> int:
+            if member in window_commits:
+                return window_commits[member]
+            params = {"q": f"repo:{self.full_repo_name} author:{member} author-date:>={since[:10]}", "per_page": 1}
+            data = await self.make_request(self._search_commits_url, params, resource='search',
+                                           decoder=SEARCH_COUNT_DECODER)
+            # If the search fails, keep the member rather than silently dropping them
+            return data.get('total_count', 0) if data else 1
+
+        counts = await asyncio.gather(*[commit_count(member) for member in members])
+        active = [member for member, count in zip(members, counts) if count]
+        print(f"{len(active)} of {len(members)} contributors committed since {since[:10]}")
+        return active
+
+    async def graphql(self, query: str, variables: Dict[str, Any]) -> Optional[Dict]:
+        """Run a GraphQL query and return its data payload.
+
+        Requests are paced by the governor's "graphql" bucket. Rate limiting and server errors are
+        retried like REST requests: the admission slot is released between attempts, a Retry-After
+        pause is applied through the governor gate, and an exhausted quota (remaining 0, or a
+        RATE_LIMITED error in a 200 response) holds the bucket until X-RateLimit-Reset. Any other
+        403 is a refusal and fails at once.
+        """
+        payload = {"query": query, "variables": variables}
+        for attempt in range(MAX_ATTEMPTS):
+            await self.governor.acquire('graphql')
+            async with self.admission.slot() as slot:
+                try:
+                    async with self.session.post(self.graphql_url, json=payload) as response:
+                        retry_after = self.governor.update(response.headers)
+                        slot.congested = response.status >= 500
+                        if response.status == 200:
+                            body = orjson.loads(await response.read())
+                            errors = body.get('errors') or []
+                            if any(error.get('type') == 'RATE_LIMITED' for error in errors):
+                                slot.congested = True
+                                reset_at = int(response.headers.get('X-RateLimit-Reset', 0)) or int(time.time()) + 60
+                                self.governor.exhausted('graphql', reset_at)
+                                print("GraphQL rate limit exhausted, retrying after the reset...")
+                                continue
+                            if errors:
+                                print(f"GraphQL errors: {errors}")
+                            return body.get('data')
+                        elif response.status in (403, 429):
+                            if await self._rate_limited(response, retry_after):
+                                slot.congested = True
+                                continue
+                            print(f"GraphQL request failed: {response.status}")
+                            return None
+                        elif response.status < 500:
+                            print(f"GraphQL request failed: {response.status}")
+                            return None
+                        print(f"GraphQL retryable status {response.status} (attempt {attempt + 1}/{MAX_ATTEMPTS})")
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    slot.congested = True
+                    print(f"GraphQL request error (attempt {attempt + 1}/{MAX_ATTEMPTS}): {str(e)}")
+                except Exception as e:
+                    print(f"GraphQL request error: {str(e)}")
+                    return None
+            await asyncio.sleep(backoff_delay(attempt))
+        print(f"Giving up on GraphQL query after {MAX_ATTEMPTS} attempts")
+        return None
+
+    async def get_author_id(self, member: str) -> Optional[str]:
+        """Resolve (and cache) the GraphQL node id used to filter commit history by author"""
+        if member not in self._author_ids:
+            data = await self.graphql(USER_ID_QUERY, {"login": member})
+            user = (data or {}).get('user')
+            self._author_ids[member] = user['id'] if user else None
+        return self._author_ids[member]
+
+    async def prefetch_author_ids(self, members: List[str]):
+        """Resolve author ids for many members up front, PR_BATCH_SIZE logins per aliased GraphQL query"""
+        missing = [member for member in members if member not in self._author_ids]
+        for i in range(0, len(missing), PR_BATCH_SIZE):
+            batch = missing[i:i + PR_BATCH_SIZE]
+            params = ", ".join(f"$l{j}: String!" for j in range(len(batch)))
+            fields = " ".join(f"u{j}: user(login: $l{j}) {{ id }}" for j in range(len(batch)))
+            data = await self.graphql(f"query({params}) {{ {fields} }}",
+                                      {f"l{j}": member for j, member in enumerate(batch)})
+            if data is None:
+                continue  # leave them to get_author_id's per-member lookup
+            for j, member in enumerate(batch):
+                user = data.get(f"u{j}")
+                self._author_ids[member] = user['id'] if user else None
+
+    async def get_commit_files(self, sha: str) -> List[Dict[str, Any]]:
+        """Get the per-file breakdown of a single commit (only used with --with-files)"""
+        detailed_commit = await self.make_request(self._commit_detail.format(sha))
+        if not detailed_commit:
             return []
-            
+        file_changes = []
+        for file in detailed_commit.get('files', []):
+            file_changes.append({
+                'filename': file.get('filename', ''),
+                'additions': file.get('additions', 0),
+                'deletions': file.get('deletions', 0),
+                'changes': file.get('changes', 0),
+                'status': file.get('status', '')
+            })
+        return file_changes
+
+    async def get_commits_for_member(self, member: str, since: str,
+                                     detail_level: Literal['summary', 'full'] = 'full') -> List[ActivityData]:
+        """Get commits for a specific member in the repository.
+
+        'summary' fetches only what the report totals need (sha, date, line counts).
+        """
+        summary = detail_level == 'summary'
+        query = COMMIT_STATS_QUERY if summary else COMMIT_HISTORY_QUERY
+        author_id = await self.get_author_id(member)
+        if not author_id:
+            return []
+
         activities = []
-        for commit in commits_data:
-            # Get detailed commit info
-            commit_url = f"{self.base_url}/repos/{self.full_repo_name}/commits/{commit['sha']}"
-            detailed_commit = await self.make_request(commit_url)
-            if detailed_commit and detailed_commit[0]:
-                commit_detail = detailed_commit[0]
-                stats = commit_detail.get('stats', {})
-                files = commit_detail.get('files', [])
-                file_changes = []
-                for file in files:
-                    file_changes.append({
-                        'filename': file.get('filename', ''),
-                        'additions': file.get('additions', 0),
-                        'deletions': file.get('deletions', 0),
-                        'changes': file.get('changes', 0),
-                        'status': file.get('status', '')
-                    })
+        cursor = None
+        while True:
+            variables = {
+                "owner": self.org_name,
+                "name": self.repo_name,
+                "authorId": author_id,
+                "since": since,
+                "cursor": cursor
+            }
+            data = await self.graphql(query, variables)
+            if data is None:
+                print(f"Commit history for {member} is incomplete: GraphQL query failed after {len(activities)} commits")
+                break
+            branch = (data.get('repository') or {}).get('defaultBranchRef')
+            if not branch:
+                break
+            history = branch['target']['history']
+            nodes = history['nodes']
+
+            if self.with_files and not summary:
+                files_per_commit = await asyncio.gather(*[self.get_commit_files(node['oid']) for node in nodes])
+            else:
+                files_per_commit = [None] * len(nodes)
+
+            for node, file_changes in zip(nodes, files_per_commit):
+                if summary:
+                    details = {'sha': node['oid']}
+                else:
+                    details = {
+                        'sha': node['oid'],
+                        'message': node['message'],
+                        'changed_files': node.get('changedFilesIfAvailable'),
+                        'url': node['url']
+                    }
                 activity = ActivityData(
                     username=member,
                     repo_name=self.full_repo_name,
                     activity_type="commit",
-                    date=self.format_date(commit['commit']['author']['date']),
-                    details={
-                        'sha': commit['sha'],
-                        'message': commit['commit']['message'],
-                        'total_additions': stats.get('additions', 0),
-                        'total_deletions': stats.get('deletions', 0),
-                        'total_changes': stats.get('total', 0),
-                        'net_changes': stats.get('additions', 0) - stats.get('deletions', 0),
-                        'files_changed': file_changes,
-                        'url': commit['html_url']
-                    }
+                    date=node['authoredDate'],
+                    details=details,
+                    additions=node.get('additions', 0),
+                    deletions=node.get('deletions', 0),
+                    files_changed=file_changes
                 )
                 activities.append(activity)
+
+            if not history['pageInfo']['hasNextPage']:
+                break
+            cursor = history['pageInfo']['endCursor']
         return activities
 
-    async def get_pull_requests_for_member(self, member: str) -> List[ActivityData]:
-        """Get pull requests for a specific member in the repository"""
+    async def _search_issues(self, qualifiers: str) -> List[Dict]:
+        """Return every /search/issues item matching `qualifiers` within this repository"""
+        url = self._search_issues_url
+        params = {"q": f"repo:{self.full_repo_name} {qualifiers}", "per_page": 100}
+        first_page = await self.make_request(url, {**params, "page": 1}, resource='search',
+                                             decoder=SEARCH_ISSUES_DECODER)
+        if not first_page:
+            return []
+        items = list(first_page.get('items', []))
+        total = min(first_page.get('total_count', 0), SEARCH_MAX_RESULTS)
+        last_page = (total + 99) // 100
+        if last_page > 1:
+            pages = await asyncio.gather(*[self.make_request(url, {**params, "page": page}, resource='search',
+                                                             decoder=SEARCH_ISSUES_DECODER)
+                                           for page in range(2, last_page + 1)])
+            for page in pages:
+                if page:
+                    items.extend(page.get('items', []))
+        return items
+
+    async def get_pr_stats(self, numbers: List[int]) -> Dict[int, Dict[str, Any]]:
+        """Get additions/deletions/changedFiles for many PRs, batching them as aliases in one GraphQL query.
+
+        With --with-files the first 100 files of each PR come back in the same query, and
+        `file_changes` is filled in; PRs with more files fall back to the paginated REST endpoint.
+        """
+        stats = {}
+        selection = "additions deletions changedFiles"
+        batch_size = PR_BATCH_SIZE
+        if self.with_files:
+            selection += " files(first: 100) { pageInfo { hasNextPage } nodes { path additions deletions changeType } }"
+            batch_size = PR_FILES_BATCH_SIZE
+        for i in range(0, len(numbers), batch_size):
+            batch = numbers[i:i + batch_size]
+            fields = " ".join(f"pr{n}: pullRequest(number: {n}) {{ {selection} }}" for n in batch)
+            query = f"query($owner: String!, $name: String!) {{ repository(owner: $owner, name: $name) {{ {fields} }} }}"
+            data = await self.graphql(query, {"owner": self.org_name, "name": self.repo_name})
+            repository = (data or {}).get('repository') or {}
+            for n in batch:
+                if repository.get(f"pr{n}"):
+                    stats[n] = repository[f"pr{n}"]
+
+        if self.with_files:
+            truncated = []
+            for n, pr in stats.items():
+                files = pr.get('files') or {}
+                if (files.get('pageInfo') or {}).get('hasNextPage'):
+                    truncated.append(n)
+                    continue
+                pr['file_changes'] = [{
+                    'filename': node['path'],
+                    'additions': node['additions'],
+                    'deletions': node['deletions'],
+                    'changes': node['additions'] + node['deletions'],
+                    'status': CHANGE_TYPES.get(node['changeType'], node['changeType'].lower())
+                } for node in files.get('nodes') or []]
+            pages = await asyncio.gather(*[self.get_pr_files(n) for n in truncated])
+            for n, file_changes in zip(truncated, pages):
+                stats[n]['file_changes'] = file_changes
+        return stats
+
+    async def get_pr_files(self, number: int) -> List[Dict[str, Any]]:
+        """Get the per-file breakdown of a single PR over REST (PRs with more than 100 files)"""
+        # The files endpoint pages at 30 by default, so walk every page rather than stopping at the first
+        files_data = await self.paged(self._pull_files.format(number))
+        file_changes = []
+        for file in files_data:
+            file_changes.append({
+                'filename': file.get('filename', ''),
+                'additions': file.get('additions', 0),
+                'deletions': file.get('deletions', 0),
+                'changes': file.get('changes', 0),
+                'status': file.get('status', '')
+            })
+        return file_changes
+
+    async def get_activity_via_search(self, member: str, since_date: str) -> List[ActivityData]:
+        """Get the PRs and issues a member opened that were updated in the tracking window.
+
+        One /search/issues query returns both; items carrying a `pull_request` key are PRs.
+        """
+        items = await self._search_issues(f"author:{member} updated:>={since_date[:10]}")
+        prs_data = [item for item in items if item.get('pull_request')]
+        issues_data = [item for item in items if not item.get('pull_request')]
+        return await self._build_pull_requests(member, prs_data) + self._build_issues(member, issues_data)
+
+    async def _build_pull_requests(self, member: str, prs_data: List[Dict]) -> List[ActivityData]:
+        """Turn PR search items into activities, adding line counts (and files with --with-files)"""
         activities = []
-        
-        # Get PRs created by member
-        for state in ['open', 'closed']:
-            url = f"{self.base_url}/repos/{self.full_repo_name}/pulls"
-            params = {
-                "creator": member,
-                "state": state,
-                "per_page": 100,
-                "sort": "updated",
-                "direction": "desc"
-            }
-            
-            prs_data = await self.make_request(url, params)
-            if not prs_data:
-                continue
-                
-            for pr in prs_data:
-                # Get PR files and changes
-                files_url = f"{self.base_url}/repos/{self.full_repo_name}/pulls/{pr['number']}/files"
-                files_data = await self.make_request(files_url)
-                
-                file_changes = []
-                total_additions = 0
-                total_deletions = 0
-                
-                if files_data:
-                    for file in files_data:
-                        additions = file.get('additions', 0)
-                        deletions = file.get('deletions', 0)
-                        file_changes.append({
-                            'filename': file.get('filename', ''),
-                            'additions': additions,
-                            'deletions': deletions,
-                            'changes': file.get('changes', 0),
-                            'status': file.get('status', '')
-                        })
-                        total_additions += additions
-                        total_deletions += deletions
-                
-                activity = ActivityData(
-                    username=member,
-                    repo_name=self.full_repo_name,
-                    activity_type="pull_request",
-                    date=self.format_date(pr['created_at']),
-                    details={
-                        'number': pr['number'],
-                        'title': pr['title'],
-                        'state': pr['state'],
-                        'merged': pr.get('merged', False),
-                        'total_additions': total_additions,
-                        'total_deletions': total_deletions,
-                        'files_changed': file_changes,
-                        'url': pr['html_url'],
-                        'created_at': self.format_date(pr['created_at']),
-                        'updated_at': self.format_date(pr['updated_at']),
-                        'merged_at': self.format_date(pr.get('merged_at')) if pr.get('merged_at') else 'N/A'
-                    }
-                )
-                activities.append(activity)
+        if not prs_data:
+            return activities
+
+        pr_stats = await self.get_pr_stats([pr['number'] for pr in prs_data])
+        if self.with_files:
+            files_per_pr = [pr_stats.get(pr['number'], {}).get('file_changes', []) for pr in prs_data]
+        else:
+            files_per_pr = [None] * len(prs_data)
+
+        for pr, file_changes in zip(prs_data, files_per_pr):
+            merged_at = (pr.get('pull_request') or {}).get('merged_at')
+            stats = pr_stats.get(pr['number'], {})
+            activity = ActivityData(
+                username=member,
+                repo_name=self.full_repo_name,
+                activity_type="pull_request",
+                date=pr['created_at'],
+                details={
+                    'number': pr['number'],
+                    'title': pr['title'],
+                    'state': pr['state'],
+                    'changed_files': stats.get('changedFiles', 0),
+                    'url': pr['html_url'],
+                    'created_at': format_date(pr['created_at']),
+                    'updated_at': format_date(pr['updated_at']),
+                    'merged_at': format_date(merged_at) if merged_at else 'N/A'
+                },
+                additions=stats.get('additions', 0),
+                deletions=stats.get('deletions', 0),
+                activity_subtype="merged" if merged_at else pr['state'],
+                files_changed=file_changes
+            )
+            activities.append(activity)
                 
         return activities
 
-    async def get_issues_for_member(self, member: str) -> List[ActivityData]:
-        """Get issues for a specific member in the repository"""
+    def _build_issues(self, member: str, issues_data: List[Dict]) -> List[ActivityData]:
+        """Turn issue search items into activities"""
         activities = []
-        
-        for state in ['open', 'closed']:
-            url = f"{self.base_url}/repos/{self.full_repo_name}/issues"
-            params = {
-                "creator": member,
-                "state": state,
-                "per_page": 100,
-                "sort": "updated",
-                "direction": "desc"
-            }
+        for issue in issues_data:
+            activity = ActivityData(
+                username=member,
+                repo_name=self.full_repo_name,
+                activity_type="issue",
+                date=issue['created_at'],
+                details={
+                    'number': issue['number'],
+                    'title': issue['title'],
+                    'state': issue['state'],
+                    'labels': [label['name'] for label in issue.get('labels', [])],
+                    'url': issue['html_url'],
+                    'created_at': format_date(issue['created_at']),
+                    'updated_at': format_date(issue['updated_at']),
+                    'closed_at': format_date(issue.get('closed_at')) if issue.get('closed_at') else 'N/A'
+                },
+                activity_subtype=issue['state']
+            )
+            activities.append(activity)
             
-            issues_data = await self.make_request(url, params)
-            if not issues_data:
-                continue
-                
-            for issue in issues_data:
-                # Skip pull requests (they appear in issues API)
-                if issue.get('pull_request'):
-                    continue
-                    
-                activity = ActivityData(
-                    username=member,
-                    repo_name=self.full_repo_name,
-                    activity_type="issue",
-                    date=self.format_date(issue['created_at']),
-                    details={
-                        'number': issue['number'],
-                        'title': issue['title'],
-                        'state': issue['state'],
-                        'labels': [label['name'] for label in issue.get('labels', [])],
-                        'url': issue['html_url'],
-                        'created_at': self.format_date(issue['created_at']),
-                        'updated_at': self.format_date(issue['updated_at']),
-                        'closed_at': self.format_date(issue.get('closed_at')) if issue.get('closed_at') else 'N/A'
-                    }
-                )
-                activities.append(activity)
-                
         return activities
 
-    async def get_member_activity(self, member: str, since_date: str) -> List[ActivityData]:
-        """Get all activity for a specific member in the repository"""
+    async def get_member_activity(self, member: str, since_date: str) -> MemberStats:
+        """Get all activity for a specific member in the repository.
+
+        Each activity record is handed to the writer task as it is collected; only the
+        running MemberStats are returned, so the full records never pile up in memory.
+        """
         print(f"Processing activity for {member} in {self.full_repo_name}...")
         
         tasks = [
-            self.get_commits_for_member(member, since_date),
-            self.get_pull_requests_for_member(member),
-            self.get_issues_for_member(member)
+            self.get_commits_for_member(member, since_date, 'summary' if self.summary_only else 'full'),
+            self.get_activity_via_search(member, since_date)
         ]
         
         # Execute all tasks concurrently
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
-        all_activities = []
+        # One sweep over each result list: update the totals and hand the record to the writer
+        stats = MemberStats()
+        jsonl_path = None
+        if self.output_dir and not self.summary_only:
+            jsonl_path = os.path.join(self.output_dir, f"{member}.jsonl")
         for result in results:
-            if isinstance(result, list):
-                all_activities.extend(result)
-            elif isinstance(result, Exception):
+            if isinstance(result, Exception):
                 print(f"Error processing {member}: {str(result)}")
+                continue
+            for activity in result:
+                stats.add(activity)
+                if jsonl_path:
+                    self.writer_queue.put_nowait(("append", jsonl_path, self._activity_row(activity)))
+        if jsonl_path:
+            self.writer_queue.put_nowait(("close", jsonl_path))
                 
-        return all_activities
+        return stats
+
+    @staticmethod
+    def _activity_row(activity: ActivityData) -> bytes:
+        # Built by hand: asdict() would deep-copy `details` and the file list for nothing
+        row = {
+            "username": activity.username,
+            "repo_name": activity.repo_name,
+            "activity_type": activity.activity_type,
+            "date": activity.date,
+            "details": activity.details,
+            "additions": activity.additions,
+            "deletions": activity.deletions,
+            "activity_subtype": activity.activity_subtype,
+            "files_changed": activity.files_changed
+        }
+        return orjson.dumps(row) + b"\n"
+
+    async def _writer_loop(self):
+        """Single consumer of writer_queue; all disk I/O runs in worker threads, so neither the
+        network coroutines nor the event loop wait on disk.
+
+        Items are ("append", path, data) to buffer a row until ("close", path) writes the file,
+        ("write", path, data, message) to write a whole file and print `message` once it is on
+        disk, or None to stop. Files that fail to write are listed in `write_failures`.
+        """
+        buffers: Dict[str, List[bytes]] = {}
+        while True:
+            item = await self.writer_queue.get()
+            try:
+                if item is None:
+                    return
+                op, path = item[0], item[1]
+                if op == "append":
+                    buffers.setdefault(path, []).append(item[2])
+                elif op == "close":
+                    rows = buffers.pop(path, None)
+                    if rows:
+                        await asyncio.to_thread(self._write_report, path, b"".join(rows))
+                elif op == "write":
+                    await asyncio.to_thread(self._write_report, path, item[2])
+                    print(item[3])
+            except OSError as e:
+                self.write_failures.append(item[1])
+                print(f"Failed to write {item[1]}: {str(e)}")
+            finally:
+                self.writer_queue.task_done()
+
+    async def _process_members(self, members: List[str], since_date: str,
+                               on_result: Callable[[str, Any], None]):
+        """Run get_member_activity through a fixed pool of workers so that only
+        max_concurrent members (and their sub-requests) are in flight at once.
 
-    async def track_repository(self, days_back: int = 30) -> Dict[str, List[ActivityData]]:
-        """Track only contributors to the repo"""
-        since_date = (datetime.now() - timedelta(days=days_back)).isoformat()
+        `on_result(member, stats_or_exception)` is called as each member finishes, so reports
+        reach the writer in completion order instead of after the slowest member.
+        """
+        queue = asyncio.Queue()
+        for member in members:
+            queue.put_nowait(member)
+
+        async def worker():
+            while True:
+                member = await queue.get()
+                try:
+                    try:
+                        result = await self.get_member_activity(member, since_date)
+                    except Exception as e:
+                        result = e
+                    on_result(member, result)
+                finally:
+                    queue.task_done()
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.max_concurrent, len(members)))]
+        await queue.join()
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def _build_summary(self, member: str, stats: MemberStats, repo_created: str, generated_on: str) -> Dict[str, Any]:
+        """Render the per-member report; the two dates are formatted once by the caller."""
+        return {
+            "username": member,
+            "repository": self.full_repo_name,
+            "repo_created": repo_created,
+            "generated_on": generated_on,
+            "date_started_working": format_date(stats.first_date),
+            "first_commit_date": format_date(stats.first_commit_date),
+            "last_commit_date": format_date(stats.last_commit_date),
+            "total_commits": stats.commits,
+            "total_pull_requests": stats.prs,
+            "total_issues": stats.issues,
+            "total_activities": stats.activities,
+            "net_changes": stats.additions - stats.deletions,
+            "total_changes": {"additions": stats.additions, "deletions": stats.deletions}
+        }
+
+    async def track_repository(self, days_back: int = 30,
+                               output_dir: str = None) -> Tuple[Dict[str, MemberStats], str]:
+        """Track only contributors to the repo, writing each member's report as it is summarised"""
+        since_date = (datetime.now(timezone.utc) - timedelta(days=days_back)).strftime('%Y-%m-%dT%H:%M:%SZ')
         print(f"Starting GitHub repository tracking for {self.full_repo_name}")
         print(f"Looking back {days_back} days (since {since_date[:10]})")
         # Get repo creation date
@@ -363,110 +1176,45 @@ class GitHubRepoTracker:
         if not members:
             print("No contributors found or API access denied")
             return {}, repo_creation_date
+        if self.active_only:
+            members = await self.members_with_activity(members, since_date)
         print(f"Processing {len(members)} contributors for repository {self.full_repo_name}...")
-        member_tasks = [self.get_member_activity(member, since_date) for member in members]
-        results = await asyncio.gather(*member_tasks, return_exceptions=True)
-        output_dir = f"github_activities_{self.repo_name}"
+        if output_dir is None:
+            output_dir = f"github_activities_{self.repo_name}"
+        print(f"Saving activity data to {output_dir}/")
         os.makedirs(output_dir, exist_ok=True)
-        member_activities = {}
-        for i, result in enumerate(results):
-            member = members[i]
-            if isinstance(result, list):
-                if any(a.activity_type in ["commit", "pull_request", "issue"] for a in result):
-                    member_activities[member] = result
-                    # Save file for this member immediately as JSON
+        self.output_dir = output_dir
+        self.write_failures = []
+        await self.prefetch_author_ids(members)
+        member_stats = {}
+        repo_created = format_date(repo_creation_date)
+        generated_on = format_date(datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+
+        def report(member: str, result: Any):
+            if isinstance(result, MemberStats):
+                if result.activities:
+                    member_stats[member] = result
+                    # Queue this member's report as soon as it is done
                     filename = os.path.join(output_dir, f"{member}.json")
-                    sorted_activities = sorted(result, key=lambda x: x.date)
-                    first_commit_date = next((a.date for a in sorted_activities if a.activity_type == "commit"), "N/A")
-                    first_date = sorted_activities[0].date if sorted_activities else "N/A"
-                    last_commit_date = next((a.date for a in reversed(sorted_activities) if a.activity_type == "commit"), "N/A")
-                    total_commits = sum(1 for a in result if a.activity_type == "commit")
-                    total_prs = sum(1 for a in result if a.activity_type == "pull_request")
-                    total_issues = sum(1 for a in result if a.activity_type == "issue")
-                    total_activities = len(result)
-                    total_additions = sum(a.details.get('total_additions', 0) for a in result if a.activity_type in ["commit", "pull_request"])
-                    total_deletions = sum(a.details.get('total_deletions', 0) for a in result if a.activity_type in ["commit", "pull_request"])
-                    net_changes = sum(a.details.get('net_changes', 0) for a in result if a.activity_type == "commit")
-                    summary = {
-                        "username": member,
-                        "repository": self.full_repo_name,
-                        "repo_created": self.format_date(repo_creation_date),
-                        "generated_on": self.format_date(datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                        "date_started_working": self.format_date(first_date),
-                        "first_commit_date": self.format_date(first_commit_date),
-                        "last_commit_date": self.format_date(last_commit_date),
-                        "total_commits": total_commits,
-                        "total_pull_requests": total_prs,
-                        "total_issues": total_issues,
-                        "total_activities": total_activities,
-                        "net_changes": total_additions - total_deletions,
-                        "total_changes": {"additions": total_additions, "deletions": total_deletions}
-                    }
-                    with open(filename, 'w', encoding='utf-8') as f:
-                        json.dump(summary, f, indent=2)
-                    print(f"Saved report for {member} to {filename}")
+                    summary = self._build_summary(member, result, repo_created, generated_on)
+                    self.writer_queue.put_nowait(("write", filename, orjson.dumps(summary, option=orjson.OPT_INDENT_2),
+                                                  f"Saved report for {member} to {filename}"))
             else:
                 print(f"Failed to process {member}: {str(result)}")
-        return member_activities, repo_creation_date
 
-    def save_to_files(self, activities: Dict[str, List[ActivityData]], repo_creation_date: str, output_dir: str = None):
-        """Save summary activities to individual JSON files for each contributor, including repo creation date"""
-        if output_dir is None:
-            output_dir = f"github_activities_{self.repo_name}"
-        os.makedirs(output_dir, exist_ok=True)
-        print(f"Saving activity data to {output_dir}/")
-        for member, member_activities in activities.items():
-            filename = os.path.join(output_dir, f"{member}.json")
-            # Sort by original date string (ISO or Y-m-d H:M:S)
-            def parse_date(d):
-                try:
-                    return datetime.strptime(d[:19], '%Y-%m-%dT%H:%M:%S')
-                except Exception:
-                    try:
-                        return datetime.strptime(d, '%Y-%m-%d %H:%M:%S')
-                    except Exception:
-                        return datetime.max
-            sorted_activities = sorted(member_activities, key=lambda x: parse_date(x.details.get('created_at', x.date)))
-            commit_activities = [a for a in member_activities if a.activity_type == "commit"]
-            # Use the original ISO date from the commit details if available, else fallback to x.date
-            def get_commit_iso_date(a):
-                # Try details['sha'] for commit, else fallback to x.date
-                try:
-                    # Most reliable: commit['commit']['author']['date'] is stored in x.details['commit_date'] if you want to add it
-                    return datetime.strptime(a.details.get('commit_date', a.date)[:19], '%Y-%m-%dT%H:%M:%S')
-                except Exception:
-                    try:
-                        return datetime.strptime(a.date, '%Y-%m-%d %H:%M:%S')
-                    except Exception:
-                        return datetime.max
-            commit_activities_sorted = sorted(commit_activities, key=get_commit_iso_date)
-            first_commit_date = commit_activities_sorted[-1].date if commit_activities_sorted else "N/A"
-            last_commit_date = commit_activities_sorted[0].date if commit_activities_sorted else "N/A"
-            first_date = sorted_activities[0].date if sorted_activities else "N/A"
-            total_commits = sum(1 for a in member_activities if a.activity_type == "commit")
-            total_prs = sum(1 for a in member_activities if a.activity_type == "pull_request")
-            total_issues = sum(1 for a in member_activities if a.activity_type == "issue")
-            total_activities = len(member_activities)
-            total_additions = sum(a.details.get('total_additions', 0) for a in member_activities if a.activity_type in ["commit", "pull_request"])
-            total_deletions = sum(a.details.get('total_deletions', 0) for a in member_activities if a.activity_type in ["commit", "pull_request"])
-            summary = {
-                "username": member,
-                "repository": self.full_repo_name,
-                "repo_created": self.format_date(repo_creation_date),
-                "generated_on": self.format_date(datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
-                "first_commit_date": self.format_date(first_commit_date),
-                "last_commit_date": self.format_date(last_commit_date),
-                "total_commits": total_commits,
-                "total_pull_requests": total_prs,
-                "total_issues": total_issues,
-                "total_activities": total_activities,
-                "net_changes": total_additions - total_deletions,
-                "total_changes": {"additions": total_additions, "deletions": total_deletions}
-            }
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2)
-            print(f"Saved report for {member} to {filename}")
-        print(f"Activity reports saved for {len(activities)} contributors")
+        await self._process_members(members, since_date, report)
+        # Reports are on disk (and JSONL files closed) by the time we return
+        await self.writer_queue.join()
+        failed_reports = sum(1 for path in self.write_failures if path.endswith('.json'))
+        print(f"Activity reports saved for {len(member_stats) - failed_reports} contributors")
+        if self.write_failures:
+            print(f"Could not write: {', '.join(self.write_failures)}")
+        return member_stats, repo_creation_date
+
+    @staticmethod
+    def _write_report(filename: str, content: bytes):
+        with open(filename, 'wb') as f:
+            f.write(content)
 
 async def main():
     parser = argparse.ArgumentParser(description="GitHub Single Repository Activity Tracker")
@@ -475,22 +1223,47 @@ async def main():
     parser.add_argument("--repo", required=True, help="Repository name (without org prefix)")
     parser.add_argument("--days", type=int, default=30, help="Days to look back (default: 30)")
     parser.add_argument("--output", help="Output directory (default: github_activities_{repo_name})")
-    parser.add_argument("--concurrent", type=int, default=20, help="Max concurrent requests")
+    parser.add_argument("--concurrent", type=int, default=20, help="Max contributors processed concurrently")
+    parser.add_argument("--connections", type=int, default=64,
+                       help="Max concurrent HTTP connections to the GitHub API (default: 64)")
     parser.add_argument("--all-contributors", action="store_true", 
                        help="Track all contributors, not just organization members")
+    parser.add_argument("--with-files", action="store_true",
+                       help="Fetch per-file changes for every commit (one extra request each) and PR (batched into the PR stats query)")
+    parser.add_argument("--active-only", action="store_true",
+                       help="Skip contributors with no commits in the window (checked via the Search API)")
+    parser.add_argument("--summary-only", action="store_true",
+                       help="Only write the per-contributor summary, skipping commit messages and the .jsonl activity log")
+    parser.add_argument("--cache-file",
+                       help="Persist the ETag response cache here so re-runs get cheap 304 responses")
     
     args = parser.parse_args()
     
     start_time = time.time()
     
-    async with GitHubRepoTracker(args.token, args.org, args.repo, args.concurrent) as tracker:
-        activities, repo_creation_date = await tracker.track_repository(args.days)
-        tracker.save_to_files(activities, repo_creation_date, args.output)
+    async with GitHubRepoTracker(args.token, args.org, args.repo, args.concurrent,
+                                 with_files=args.with_files, cache_path=args.cache_file,
+                                 max_connections=args.connections, active_only=args.active_only,
+                                 summary_only=args.summary_only) as tracker:
+        await tracker.track_repository(args.days, args.output)
     
     end_time = time.time()
     print(f"Completed in {end_time - start_time:.2f} seconds")
 
 if __name__ == "__main__":
+    # uvloop is a faster drop-in event loop for this socket-heavy workload; it is POSIX-only,
+    # so fall back to the stdlib loop when it isn't installed
+    try:
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+    # Command line arguments take precedence; main() parses and validates them
+    if len(sys.argv) > 1:
+        asyncio.run(main())
+        sys.exit(0)
+
     # For running without command line args (set your values here)
     TOKEN = os.getenv("GITHUB_TOKEN", "your_github_token_here")
     ORG_NAME = os.getenv("GITHUB_ORG", "your_org_name_here")
@@ -510,6 +1283,5 @@ if __name__ == "__main__":
     else:
         async def run_with_env():
             async with GitHubRepoTracker(TOKEN, ORG_NAME, REPO_NAME) as tracker:
-                activities, repo_creation_date = await tracker.track_repository(DAYS_BACK)
-                tracker.save_to_files(activities, repo_creation_date)
+                await tracker.track_repository(DAYS_BACK)
         asyncio.run(run_with_env())
\ No newline at end of file